@@ -3,39 +3,137 @@
 Ufora CLI - A command-line tool for accessing UGent course materials from Ufora
 """
 
+import atexit
+import functools
 import json
-import pickle
+import os
 import re
+import shutil
+import threading
+import time
 from pathlib import Path
-from datetime import datetime
 from urllib.parse import urljoin
 
 import click
-import requests
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
-from rich.console import Console
-from rich.table import Table
-from rich.prompt import Prompt
-from rich.progress import Progress
 
-console = Console()
+
+class _LazyConsole:
+    """Stand-in for the rich Console that only imports rich once something is printed"""
+    
+    _console = None
+    # Worker threads (e.g. subfolder fetches) may print first, so only one of them may create the Console
+    _lock = threading.Lock()
+    
+    def __getattr__(self, name):
+        if _LazyConsole._console is None:
+            with _LazyConsole._lock:
+                if _LazyConsole._console is None:
+                    from rich.console import Console
+                    _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+
+
+# Heavy dependencies (requests, lxml, rich, playwright) are imported inside the
+# functions that need them, to keep startup fast for commands that don't
+console = _LazyConsole()
 
 # Configuration
 CONFIG_DIR = Path.home() / ".config" / "ufora-cli"
-COOKIES_FILE = CONFIG_DIR / "cookies.pkl"
+COOKIES_FILE = CONFIG_DIR / "cookies.json"
+LEGACY_COOKIES_FILE = CONFIG_DIR / "cookies.pkl"
 CONFIG_FILE = CONFIG_DIR / "config.json"
+COURSES_CACHE_FILE = CONFIG_DIR / "courses_cache.json"
+COURSES_CACHE_TTL = 24 * 60 * 60  # Enrollments rarely change, so refresh once a day
+CONTENT_CACHE_DIR = CONFIG_DIR / "cache"
+CONTENT_CACHE_TTL = 10 * 60  # Course content changes more often, keep it for a few minutes
 BASE_URL = "https://ufora.ugent.be"
 LOGIN_URL = "https://elosp.ugent.be/welcome/uforalogin?"
 LOGGED_IN_URL = "https://ufora.ugent.be/d2l/home"
+# Keep-alive connections per host; concurrent workers should never outnumber this
+HTTP_POOL_SIZE = 32
+# Kept low by default so bulk downloads don't hammer the Ufora servers
+DEFAULT_DOWNLOAD_THREADS = 4
 
 CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Patterns used while scraping the course content pages
+_VIEW_CONTENT_RE = re.compile(r'/viewContent/(\d+)/View')
+_MODULE_ID_RE = re.compile(r'D2L_LE_Content_TreeBrowser_D2L\.LE\.Content\.ContentObject\.ModuleCO-(\d+)')
+# Number shown on the Microsoft sign-in page for app-based 2FA
+_TWOFA_CODE_RE = re.compile(r'^\d{2}$')
+# Characters that are not allowed in file and folder names
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Content types that are listed in a module but have no file to download
+_NONDOWNLOADABLE = frozenset({'Assignment', 'Discussion Topic'})
+
+
+def _sanitize(name):
+    """Replace characters that can't be used in file names"""
+    return _SANITIZE_RE.sub('_', name)
+
+
+def _downloadable(items):
+    """Keep only the materials that can be downloaded as files"""
+    return [item for item in items if item['type'] not in _NONDOWNLOADABLE]
+
+
+def _has_class(name):
+    """XPath predicate matching elements that have the given class among their classes"""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+def _get_text(element):
+    """Text content of an element with every text fragment stripped (like BeautifulSoup's get_text(strip=True))"""
+    return ''.join(text.strip() for text in element.itertext())
+
+
+# XPath queries used while scraping the course content pages
+_TOC_XPATH = '//ul[normalize-space(@class)="d2l-datalist vui-list"]'
+_ROOT_MODULE_XPATH = './/li[normalize-space(@class)="d2l-datalist-item d2l-datalist-newitem d2l-datalist-item-hide-separators d2l-datalist-simpleitem"]'
+_MODULE_HEADER_XPATH = './/h2'
+_FILE_ITEM_XPATH = f'.//li[{_has_class("d2l-datalist-item")}]'
+_FILE_LINK_XPATH = f'.//a[{_has_class("d2l-link")}][contains(@href, "/d2l/le/content/")]'
+_FILE_TYPE_XPATH = './/div[normalize-space(@class)="d2l-textblock d2l-body-small"]'
+_NESTED_MODULE_XPATH = (
+    f'//li[{_has_class("d2l-le-TreeAccordionItem")}]'
+    '[starts-with(@id, "D2L_LE_Content_TreeBrowser_D2L.LE.Content.ContentObject.ModuleCO-")]'
+    f'[not({_has_class("d2l-le-TreeAccordionItem-Root")})]'
+)
+_ROOT_PARENT_XPATH = 'ancestor::li[normalize-space(@class)="d2l-le-TreeAccordionItem d2l-le-TreeAccordionItem-Root"][1]'
+_TEXTBLOCK_XPATH = f'.//div[{_has_class("d2l-textblock")}]'
+
+
+@functools.lru_cache(maxsize=None)
+def _xpath(expression):
+    """Compile an XPath query once, on first use, and reuse it for every element it is run on"""
+    from lxml import etree
+    return etree.XPath(expression)
+
+
+def _parse_html(response):
+    """
+    Parse an HTML response with the charset requests determined for it, as response.text would.
+    libxml2 would otherwise fall back to Latin-1 for pages without a <meta charset>, like the XHR partials.
+    """
+    import lxml.html
+    parser = lxml.html.HTMLParser(encoding=response.encoding or response.apparent_encoding)
+    return lxml.html.document_fromstring(response.content, parser=parser)
+
 
 class UforaSession:
     """Manages authentication and requests to Ufora"""
     
+    # Launching the browser is the slowest part of authenticating, so one headless
+    # instance is shared by every login/refresh within this process
+    _playwright = None
+    _browser = None
+    
     def __init__(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -46,20 +144,94 @@ class UforaSession:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         })
+        # One sized adapter for the whole run, so concurrent requests reuse keep-alive
+        # connections instead of discarding them when the pool is full
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Earliest expiry (epoch seconds) of the saved Ufora cookies, 0 if unknown
+        self._earliest_expiry = 0
+        # Set once ensure_authenticated has confirmed the session, so later calls are free
+        self._authenticated = False
     
     def load_cookies(self):
         """Load cookies from file"""
+        if not COOKIES_FILE.exists() and LEGACY_COOKIES_FILE.exists():
+            self._migrate_legacy_cookies()
+        
         if COOKIES_FILE.exists():
-            with open(COOKIES_FILE, 'rb') as f:
-                cookies = pickle.load(f)
-                self.session.cookies.update(cookies)
+            with open(COOKIES_FILE, 'r') as f:
+                cookies = json.load(f)
+            for cookie in cookies:
+                self.session.cookies.set(
+                    cookie['name'],
+                    cookie['value'],
+                    domain=cookie['domain'],
+                    path=cookie['path'],
+                    expires=cookie['expires'],
+                    secure=cookie['secure']
+                )
+            
+            # Session cookies have no expiry, so only the network check can tell if they are still valid
+            expiries = [cookie.expires for cookie in self.session.cookies if cookie.domain.endswith('ufora.ugent.be')]
+            if expiries and None not in expiries:
+                self._earliest_expiry = min(expiries)
             return True
         return False
     
     def save_cookies(self):
         """Save cookies to file"""
-        with open(COOKIES_FILE, 'wb') as f:
-            pickle.dump(self.session.cookies, f)
+        cookies = [
+            {
+                'name': cookie.name,
+                'value': cookie.value,
+                'domain': cookie.domain,
+                'path': cookie.path,
+                'expires': cookie.expires,
+                'secure': cookie.secure
+            }
+            for cookie in self.session.cookies
+        ]
+        with open(COOKIES_FILE, 'w') as f:
+            json.dump(cookies, f)
+    
+    def _migrate_legacy_cookies(self):
+        """Convert cookies saved by older versions (pickled cookie jar) to the JSON format"""
+        import pickle
+        
+        try:
+            with open(LEGACY_COOKIES_FILE, 'rb') as f:
+                self.session.cookies.update(pickle.load(f))
+            self.save_cookies()
+        except Exception as e:
+            console.print(f"[yellow]Could not migrate saved cookies: {e}[/yellow]")
+        LEGACY_COOKIES_FILE.unlink(missing_ok=True)
+    
+    def _install_playwright_cookies(self, cookies):
+        """Copy cookies returned by a Playwright browser context into the requests session"""
+        from requests.cookies import RequestsCookieJar, create_cookie
+        
+        jar = RequestsCookieJar()
+        for cookie in cookies:
+            expires = None
+            if 'expires' in cookie and cookie['expires'] != -1:
+                expires = int(cookie['expires'])
+            
+            jar.set_cookie(create_cookie(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain', ''),
+                path=cookie.get('path', '/'),
+                secure=cookie.get('secure', False),
+                expires=expires
+            ))
+        
+        self.session.cookies.update(jar)
     
     def is_authenticated(self):
         """Check if current session is authenticated"""
@@ -71,8 +243,33 @@ class UforaSession:
             console.print(f"[red]Error checking authentication: {e}[/red]")
             return False
     
+    @classmethod
+    def _get_browser(cls):
+        """Return the shared headless browser, launching it on first use"""
+        if cls._browser is None:
+            if cls._playwright is None:
+                # Imported here so commands that never open a browser don't pay for loading Playwright
+                from playwright.sync_api import sync_playwright
+                
+                cls._playwright = sync_playwright().start()
+                atexit.register(cls._close_browser)
+            cls._browser = cls._playwright.firefox.launch(headless=True)
+        return cls._browser
+    
+    @classmethod
+    def _close_browser(cls):
+        """Shut down the shared browser and the Playwright driver"""
+        if cls._browser is not None:
+            cls._browser.close()
+            cls._browser = None
+        if cls._playwright is not None:
+            cls._playwright.stop()
+            cls._playwright = None
+    
     def login_with_browser(self):
-        """Login via headless browser and extract 2FA code"""
+        """Login via headless browser and extract 2FA code. Returns whether the login succeeded."""
+        from rich.prompt import Prompt
+        
         console.print("[yellow]Logging in...[/yellow]")
 
         config = load_config()
@@ -82,230 +279,251 @@ class UforaSession:
         email = Prompt.ask("\n[cyan]Enter your UGent email[/cyan]", default=set_email)
         password = Prompt.ask("[cyan]Enter your password[/cyan]", password=True)
 
-        with sync_playwright() as p:
-            browser = p.firefox.launch(headless=True)
-            context = browser.new_context(
-                locale='en-US',
-                extra_http_headers={
-                    'Accept-Language': 'en-US,en;q=0.9'
-                }
-            )
-            page = context.new_page()
-            
-            console.print("\n[yellow]Inserting login information...[/yellow]")
+        browser = UforaSession._get_browser()
+        context = browser.new_context(
+            locale='en-US',
+            extra_http_headers={
+                'Accept-Language': 'en-US,en;q=0.9'
+            }
+        )
+        page = context.new_page()
+        
+        console.print("\n[yellow]Inserting login information...[/yellow]")
 
-            try:
-                page.goto(LOGIN_URL)
-                
-                # Fill in email
-                page.fill('input[placeholder="Email"]', email)
-                page.locator('text=Next').click()
+        try:
+            page.goto(LOGIN_URL)
+            
+            # Fill in email
+            page.fill('input[placeholder="Email"]', email)
+            page.locator('text=Next').click()
 
-                # Fill in password
-                page.fill('input[placeholder="Password"]', password)
-                page.locator('text=Sign in').click()
-                
-                page.wait_for_timeout(2000)
+            # Fill in password
+            page.fill('input[placeholder="Password"]', password)
+            page.locator('text=Sign in').click()
             
-                # Handle 2FA based on configured method
-                if twofa_method == 'app':
-                    # Try to extract 2FA code from the page
-                    console.print("[yellow]Finding 2FA code...[/yellow]")
-                    try:
-                        all_divs = page.query_selector_all('div')
-                        for div in all_divs:
-                            text = (div.text_content() or '').strip()
-                            if text.isdigit() and len(text) == 2:
-                                console.print(f"\n[green]2FA Code: {text}[/green]")
-                                console.print("[yellow]Enter this code on your device to complete authentication[/yellow]\n")
-                                break
-                    except:
-                        pass
-                else:  # sms
-                    # Select Text
-                    page.locator('text=Text').click()
-
-                    console.print("[yellow]2FA code will be sent via SMS[/yellow]")
-                    
-                    # Prompt user for the SMS code
-                    sms_code = Prompt.ask("\n[cyan]Enter the 2FA code from SMS[/cyan]")
-                    
-                    # Find the input field for the 2FA code and enter it
+            page.wait_for_timeout(2000)
+        
+            # Handle 2FA based on configured method
+            if twofa_method == 'app':
+                # Try to extract 2FA code from the page
+                console.print("[yellow]Finding 2FA code...[/yellow]")
+                try:
                     try:
-                        # Look for the verification code input field
-                        code_input = page.locator('input[name="otc"]').or_(page.locator('input[type="tel"]'))
-                        code_input.fill(sms_code)
-                        
-                        # Click verify/submit button
-                        page.locator('text=Verify').or_(page.locator('input[type="submit"]')).click()
-                        
-                        console.print("[green]✓ 2FA code submitted[/green]")
-                    except Exception as e:
-                        console.print(f"[red]Error entering 2FA code: {e}[/red]")
-                        console.print("[yellow]You may need to manually complete the 2FA step[/yellow]")
-                
-                # Wait for successful login (redirect away from auth page)
-                console.print("[yellow]Waiting for authentication to complete...[/yellow]")
-                page.wait_for_url(LOGGED_IN_URL, timeout=120000)
+                        # Microsoft shows the number to match in this element
+                        node = page.wait_for_selector('#idRichContext_DisplaySign, div[data-bind*="displaySign"]', timeout=10000)
+                        text = (node.text_content() or '').strip()
+                    except Exception:
+                        # Fall back to any div holding just a two-digit number, matched by Playwright itself
+                        text = (page.locator('div').filter(has_text=_TWOFA_CODE_RE).first.text_content(timeout=5000) or '').strip()
                     
-                # Extract cookies
-                cookies = context.cookies()
-                browser.close()
+                    if text.isdigit() and len(text) == 2:
+                        console.print(f"\n[green]2FA Code: {text}[/green]")
+                        console.print("[yellow]Enter this code on your device to complete authentication[/yellow]\n")
+                except:
+                    pass
+            else:  # sms
+                # Select Text
+                page.locator('text=Text').click()
+
+                console.print("[yellow]2FA code will be sent via SMS[/yellow]")
                 
-                # Convert to requests format
-                for cookie in cookies:
-
-                    expires = None
-                    if 'expires' in cookie and cookie['expires'] != -1:
-                        expires = int(cookie['expires'])
-
-                    self.session.cookies.set(
-                        cookie['name'],
-                        cookie['value'],
-                        domain=cookie.get('domain', ''),
-                        path=cookie.get('path', '/'),
-                        secure=cookie.get('secure', False),
-                        expires=expires
-                    )
+                # Prompt user for the SMS code
+                sms_code = Prompt.ask("\n[cyan]Enter the 2FA code from SMS[/cyan]")
                 
-                self.save_cookies()
-                console.print("[green]✓ Login successful! Cookies saved.[/green]")
+                # Find the input field for the 2FA code and enter it
+                try:
+                    # Look for the verification code input field
+                    code_input = page.locator('input[name="otc"]').or_(page.locator('input[type="tel"]'))
+                    code_input.fill(sms_code)
+                    
+                    # Click verify/submit button
+                    page.locator('text=Verify').or_(page.locator('input[type="submit"]')).click()
+                    
+                    console.print("[green]✓ 2FA code submitted[/green]")
+                except Exception as e:
+                    console.print(f"[red]Error entering 2FA code: {e}[/red]")
+                    console.print("[yellow]You may need to manually complete the 2FA step[/yellow]")
+            
+            # Wait for successful login (redirect away from auth page)
+            console.print("[yellow]Waiting for authentication to complete...[/yellow]")
+            page.wait_for_url(LOGGED_IN_URL, timeout=120000)
                 
-            except Exception as e:
-                console.print(f"[red]✗ Login failed: {e}[/red]")
-                browser.close()
+            # Extract cookies
+            cookies = context.cookies()
+            context.close()
+            
+            # Convert to requests format
+            self._install_playwright_cookies(cookies)
+            
+            self.save_cookies()
+            # The cached course data may belong to a different account
+            clear_caches()
+            console.print("[green]✓ Login successful! Cookies saved.[/green]")
+            return True
+            
+        except Exception as e:
+            console.print(f"[red]✗ Login failed: {e}[/red]")
+            context.close()
+            return False
     
     def refresh_session_with_persistent_cookies(self):
         """Try to get new session cookies using persistent Microsoft cookies"""
         try:
             console.print("[yellow]Refreshing with saved credentials...[/yellow]")
             
-            from playwright.sync_api import sync_playwright
+            browser = UforaSession._get_browser()
             
-            with sync_playwright() as p:
-                browser = p.firefox.launch(headless=True)
-                
-                # Create context with our existing cookies
-                context = browser.new_context(
-                    locale='en-US',
-                    extra_http_headers={
-                        'Accept-Language': 'en-US,en;q=0.9'
-                    }
-                )
-                
-                # Add all our cookies to the browser context
-                playwright_cookies = []
-                for cookie in self.session.cookies:
-                    playwright_cookie = {
-                        'name': cookie.name,
-                        'value': cookie.value,
-                        'domain': cookie.domain,
-                        'path': cookie.path,
-                    }
-                    if cookie.expires:
-                        playwright_cookie['expires'] = cookie.expires
-                    if cookie.secure:
-                        playwright_cookie['secure'] = True
-                        
-                    playwright_cookies.append(playwright_cookie)
-                
-                context.add_cookies(playwright_cookies)
-                
-                page = context.new_page()
-                
-                # Navigate to Ufora - should get to welcome page
-                page.goto(BASE_URL, timeout=30000)
-                page.wait_for_timeout(2000)
-                
-                # If we're at the welcome page, click the Ufora login button
-                if 'elosp.ugent.be/welcome' in page.url:
-                    console.print("[yellow]At welcome page, clicking Ufora login...[/yellow]")
-                    try:
-                        # Click the Ufora login button
-                        page.locator('text=Ufora login').click()
-                        
-                        # Wait a bit for redirect
-                        page.wait_for_timeout(3000)
-                        
-                        # Check if we're at Microsoft account picker
-                        if 'login.microsoftonline.com' in page.url and 'select_account' in page.url:
-                            console.print("[yellow]At account picker, selecting account...[/yellow]")
-                            try:
-                                # Click on the first account (your signed-in account)
-                                account = page.locator('div.table-row').filter(has_text='Signed in').first
-                                account.click()
-
-                                # Wait for navigation to complete
-                                page.wait_for_url('**/d2l/home**', timeout=20000)
-                            except Exception as e:
-                                console.print(f"Could not select account: {e}")
-                                # Try alternative selector
-                                try:
-                                    page.locator('div[role="button"]:has-text("Signed in")').click()
-                                    page.wait_for_url('**/d2l/home**', timeout=30000)
-                                except:
-                                    pass
-                        else:
-                            # Not at account picker, maybe already navigated through
-                            page.wait_for_url('**/d2l/home**', timeout=30000)
-                        
-                    except Exception as e:
-                        console.print(f"Navigation error: {e}")
-                
-                final_url = page.url
-                
-                # Check if we're authenticated
-                if 'ufora.ugent.be' in final_url and 'elosp' not in final_url:
-                    # Extract new cookies
-                    new_cookies = context.cookies()
+            # Create context with our existing cookies
+            context = browser.new_context(
+                locale='en-US',
+                extra_http_headers={
+                    'Accept-Language': 'en-US,en;q=0.9'
+                }
+            )
+            
+            # Add all our cookies to the browser context
+            playwright_cookies = []
+            for cookie in self.session.cookies:
+                playwright_cookie = {
+                    'name': cookie.name,
+                    'value': cookie.value,
+                    'domain': cookie.domain,
+                    'path': cookie.path,
+                }
+                if cookie.expires:
+                    playwright_cookie['expires'] = cookie.expires
+                if cookie.secure:
+                    playwright_cookie['secure'] = True
+                    
+                playwright_cookies.append(playwright_cookie)
+            
+            context.add_cookies(playwright_cookies)
+            
+            page = context.new_page()
+            
+            # Navigate to Ufora - should get to welcome page
+            page.goto(BASE_URL, timeout=30000)
+            page.wait_for_timeout(2000)
+            
+            # If we're at the welcome page, click the Ufora login button
+            if 'elosp.ugent.be/welcome' in page.url:
+                console.print("[yellow]At welcome page, clicking Ufora login...[/yellow]")
+                try:
+                    # Click the Ufora login button
+                    page.locator('text=Ufora login').click()
                     
-                    # Update session with new cookies
-                    for cookie in new_cookies:
-                        expires = None
-                        if 'expires' in cookie and cookie['expires'] != -1:
-                            expires = int(cookie['expires'])
-                        
-                        self.session.cookies.set(
-                            cookie['name'],
-                            cookie['value'],
-                            domain=cookie.get('domain', ''),
-                            path=cookie.get('path', '/'),
-                            secure=cookie.get('secure', False),
-                            expires=expires
-                        )
+                    # Wait a bit for redirect
+                    page.wait_for_timeout(3000)
                     
-                    browser.close()
-                    self.save_cookies()
-                    console.print("[green]✓ Session refreshed successfully![/green]")
-                    return True
+                    # Check if we're at Microsoft account picker
+                    if 'login.microsoftonline.com' in page.url and 'select_account' in page.url:
+                        console.print("[yellow]At account picker, selecting account...[/yellow]")
+                        try:
+                            # Click on the first account (your signed-in account)
+                            account = page.locator('div.table-row').filter(has_text='Signed in').first
+                            account.click()
+
+                            # Wait for navigation to complete
+                            page.wait_for_url('**/d2l/home**', timeout=20000)
+                        except Exception as e:
+                            console.print(f"Could not select account: {e}")
+                            # Try alternative selector
+                            try:
+                                page.locator('div[role="button"]:has-text("Signed in")').click()
+                                page.wait_for_url('**/d2l/home**', timeout=30000)
+                            except:
+                                pass
+                    else:
+                        # Not at account picker, maybe already navigated through
+                        page.wait_for_url('**/d2l/home**', timeout=30000)
+                    
+                except Exception as e:
+                    console.print(f"Navigation error: {e}")
+            
+            final_url = page.url
+            
+            # Check if we're authenticated
+            if 'ufora.ugent.be' in final_url and 'elosp' not in final_url:
+                # Extract new cookies
+                new_cookies = context.cookies()
                 
-                browser.close()
-                console.print(f"[yellow]Could not refresh ...[/yellow]")
-                return False
+                # Update session with new cookies
+                self._install_playwright_cookies(new_cookies)
                 
+                context.close()
+                self.save_cookies()
+                console.print("[green]✓ Session refreshed successfully![/green]")
+                return True
+            
+            context.close()
+            console.print(f"[yellow]Could not refresh ...[/yellow]")
+            return False
+            
         except Exception as e:
             console.print(f"[yellow]Session refresh failed: {e}[/yellow]")
             return False
 
     def ensure_authenticated(self):
-        """Ensure we have a valid authenticated session"""
+        """Ensure we have a valid authenticated session. Returns whether the session is authenticated."""
+        if self._authenticated:
+            return True
+        
         if self.load_cookies():
+            # Skip the network round-trip while none of the Ufora cookies is about to expire
+            if self._earliest_expiry > time.time() + 60:
+                self._authenticated = True
+                return True
             if self.is_authenticated():
-                return
+                self._authenticated = True
+                return True
             else:
                 console.print("[yellow]Session expired...[/yellow]")
                 # Try to refresh using persistent cookies first
                 if self.refresh_session_with_persistent_cookies():
-                    return
+                    self._authenticated = True
+                    return True
                 console.print("[yellow]Need to re-login with password/2FA[/yellow]")
         
-        self.login_with_browser()
+        self._authenticated = self.login_with_browser()
+        return self._authenticated
     
     def get(self, url, **kwargs):
         """Make authenticated GET request"""
         return self.session.get(url, **kwargs)
 
 
+def _is_active_course(enrollment):
+    """Whether an enrollment is an active course offering (OrgUnit type 3)"""
+    return enrollment.get('OrgUnit', {}).get('Type', {}).get('Id') == 3 and enrollment.get('Access', {}).get('IsActive')
+
+
+def _to_course(enrollment, base_url):
+    """Convert an enrollment from the Brightspace API into a course dictionary"""
+    org_unit = enrollment.get('OrgUnit', {})
+    course_id = str(org_unit.get('Id', ''))
+    course_name = org_unit.get('Name', '')
+    course_code = org_unit.get('Code', '')
+    start_date = enrollment.get('Access', {}).get('StartDate', '')
+
+    if " - " in course_name:
+        course_name = course_name.split(" - ", 1)[1]
+
+    if course_code and course_code != course_name:
+        title = f"{course_code} - {course_name}"
+    else:
+        title = course_name
+    
+    return {
+        'title': title,
+        'url': f"{base_url}/d2l/home/{course_id}",
+        'content_url': f"{base_url}/d2l/le/content/{course_id}/Home",
+        'id': course_id,
+        'code': course_code,
+        'name': course_name,
+        'start': start_date
+    }
+
+
 class UforaCourses:
     """Handles course listing and materials"""
     
@@ -314,6 +532,8 @@ class UforaCourses:
     
     def get_courses(self):
         """Fetch list of courses using the Brightspace API with pagination"""
+        import requests
+        
         try:
             # Use the D2L/Brightspace API to get enrollments
             api_versions = ['1.28', '1.9', '1.8', '1.4', '1.0']
@@ -322,12 +542,28 @@ class UforaCourses:
             response = None
             api_url = None
             
-            # Try different API versions
-            for version in api_versions:
-                api_url = f"{BASE_URL}/d2l/api/lp/{version}/enrollments/myenrollments/"
+            # Try the API version that worked last time before probing the others
+            cached_version = load_config().get('d2l_api_version')
+            if cached_version:
+                api_url = f"{BASE_URL}/d2l/api/lp/{cached_version}/enrollments/myenrollments/"
                 response = self.session.get(api_url)
-                if response.status_code == 200:
-                    break
+            
+            if not response or response.status_code != 200:
+                # Try different API versions
+                for version in api_versions:
+                    if version == cached_version:
+                        continue
+                    
+                    api_url = f"{BASE_URL}/d2l/api/lp/{version}/enrollments/myenrollments/"
+                    try:
+                        response = self.session.get(api_url, timeout=10)
+                    except requests.RequestException:
+                        continue
+                    
+                    if response.status_code == 200:
+                        # Remember the working version so the next run skips the probing
+                        save_config({**load_config(), 'd2l_api_version': version})
+                        break
             
             if not response or response.status_code != 200:
                 console.print(f"[red]API returned status code: {response.status_code if response else 'No response'}[/red]")
@@ -337,34 +573,8 @@ class UforaCourses:
             while response:
                 enrollments = response.json()
                 
-                for enrollment in enrollments.get('Items', []):
-                    org_unit = enrollment.get('OrgUnit', {})
-                    access = enrollment.get('Access', {})
-                    
-                    # Only include course offerings (Type 3) that are active
-                    if org_unit.get('Type', {}).get('Id') == 3 and access.get('IsActive'):
-                        course_id = str(org_unit.get('Id', ''))
-                        course_name = org_unit.get('Name', '')
-                        course_code = org_unit.get('Code', '')
-                        start_date = access.get('StartDate', '')
-
-                        if " - " in course_name:
-                            course_name = course_name.split(" - ", 1)[1]
-
-                        if course_code and course_code != course_name:
-                            title = f"{course_code} - {course_name}"
-                        else:
-                            title = course_name
-                        
-                        courses.append({
-                            'title': title,
-                            'url': f"{BASE_URL}/d2l/home/{course_id}",
-                            'content_url': f"{BASE_URL}/d2l/le/content/{course_id}/Home",
-                            'id': course_id,
-                            'code': course_code,
-                            'name': course_name,
-                            'start': start_date
-                        })
+                items = enrollments.get('Items', ())
+                courses.extend(_to_course(item, BASE_URL) for item in items if _is_active_course(item))
                 
                 # Check if there is a Bookmark for the next page
                 if enrollments.get('PagingInfo', {}).get('HasMoreItems', False):
@@ -394,21 +604,22 @@ class UforaCourses:
         Returns a list of material dictionaries with title, url, type, and id.
         """
         materials = []
-        file_items = module_list.find_all('li', class_='d2l-datalist-item')
+        file_items = _xpath(_FILE_ITEM_XPATH)(module_list)
         
         for file_item in file_items:
-            link = file_item.find('a', class_='d2l-link', href=re.compile(r'/d2l/le/content/'))
-            if link:
-                title = link.get_text(strip=True)
+            links = _xpath(_FILE_LINK_XPATH)(file_item)
+            if links:
+                link = links[0]
+                title = _get_text(link)
                 url = link.get('href', '')
                 
                 # Extract content ID from URL
-                file_id_match = re.search(r'/viewContent/(\d+)/View', url)
+                file_id_match = _VIEW_CONTENT_RE.search(url)
                 file_id = file_id_match.group(1) if file_id_match else None
                 
                 # Get file type
-                file_type_elem = file_item.find('div', class_='d2l-textblock d2l-body-small')
-                file_type = file_type_elem.get_text(strip=True) if file_type_elem else 'Unknown'
+                file_type_elems = _xpath(_FILE_TYPE_XPATH)(file_item)
+                file_type = _get_text(file_type_elems[0]) if file_type_elems else 'Unknown'
                 
                 if url:
                     materials.append({
@@ -420,25 +631,63 @@ class UforaCourses:
         
         return materials
 
+    def _fetch_subfolder(self, content_url, folder_id, folder_name, parent_name):
+        """
+        Fetch the contents of a single subfolder.
+        Returns a (parent_name, subfolder) tuple, or None if the subfolder could not be fetched.
+        """
+        try:
+            modified_url = content_url.rstrip('Home') + 'ModuleDetailsPartial'
+            params = {
+                'mId': folder_id,
+                'writeHistoryEntry': '0',
+                '_d2l_prc$headingLevel': '2',
+                '_d2l_prc$scope': '',
+                '_d2l_prc$hasActiveForm': 'false',
+                'isXhr': 'true',
+            }
+            
+            # Parse the submodule contents straight from the partial response; re-reading the
+            # main content page would depend on server-side state shared by all concurrent requests
+            response = self.session.get(modified_url, params=params)
+            # An error page would otherwise parse as an empty subfolder
+            response.raise_for_status()
+            partial_tree = _parse_html(response)
+            
+            # Extract materials from this submodule
+            subfolder_materials = self._extract_materials_from_page(partial_tree)
+            
+            return parent_name, {
+                'name': folder_name,
+                'materials': subfolder_materials
+            }
+            
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not fetch contents for subfolder '{folder_name}': {e}[/yellow]")
+            return None
+
     # (Only one level of nested module is supported at this moment)
-    def get_course_content(self, content_url):
-        """Get all content/materials for a course, grouped by modules (including nested)"""
+    def get_course_content(self, content_url, failed_subfolders=None):
+        """
+        Get all content/materials for a course, grouped by modules (including nested).
+        If a failed_subfolders list is given, the names of subfolders that could not be fetched are added to it.
+        """
         try:
-            # Fetch the main course content page
+            # Fetch and parse the main course content page once; subfolders are read from their own partials
             response = self.session.get(content_url)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            root_tree = _parse_html(response)
             
             modules = {}
             
             # Get root-level modules and their files
-            table_of_contents = soup.find('ul', class_='d2l-datalist vui-list')
+            table_of_contents = _xpath(_TOC_XPATH)(root_tree)
             
             if not table_of_contents:
                 console.print("[red]Table of contents not found on the course page[/red]")
                 return []
             
             # Find root-level module items
-            module_lists = table_of_contents.find_all('li', class_='d2l-datalist-item d2l-datalist-newitem d2l-datalist-item-hide-separators d2l-datalist-simpleitem')
+            module_lists = _xpath(_ROOT_MODULE_XPATH)(table_of_contents[0])
             
             if not module_lists:
                 console.print("[red]Modules not found in the table of contents[/red]")
@@ -446,11 +695,11 @@ class UforaCourses:
             
             # Process each root-level module
             for module_list in module_lists:
-                module_header = module_list.find('h2')
-                if not module_header:
+                module_headers = _xpath(_MODULE_HEADER_XPATH)(module_list)
+                if not module_headers:
                     continue
                 
-                module_name = module_header.get_text(strip=True)
+                module_name = _get_text(module_headers[0])
                 if not module_name:
                     continue
                 
@@ -464,80 +713,65 @@ class UforaCourses:
                         'subfolders': []
                     }
 
-            # Find and process nested modules (subfolders)
-            nested_modules = soup.find_all(
-                'li',
-                class_='d2l-le-TreeAccordionItem',
-                id=lambda x: x and x.startswith('D2L_LE_Content_TreeBrowser_D2L.LE.Content.ContentObject.ModuleCO-')
-            )
-            
-            # Filter to only non-root items (items that are nested)
-            filtered_nested = [item for item in nested_modules if 'd2l-le-TreeAccordionItem-Root' not in item.get('class', [])]
+            # Find nested modules (subfolders), leaving out the root-level items
+            filtered_nested = _xpath(_NESTED_MODULE_XPATH)(root_tree)
             
-            # Process each nested module
+            # Collect the subfolders to fetch, with the module they belong to
+            subfolder_jobs = []
             for nested_item in filtered_nested:
                 # Find parent module name
-                parent = nested_item.find_parent('li', class_='d2l-le-TreeAccordionItem d2l-le-TreeAccordionItem-Root')
-                if not parent:
+                parents = _xpath(_ROOT_PARENT_XPATH)(nested_item)
+                if not parents:
                     continue
                 
-                parent_header = parent.find('div', class_='d2l-textblock')
-                parent_name = parent_header.get_text(strip=True) if parent_header else None
+                parent_headers = _xpath(_TEXTBLOCK_XPATH)(parents[0])
+                parent_name = _get_text(parent_headers[0]) if parent_headers else None
                 if not parent_name:
                     continue
                 
                 # Get subfolder name and ID
-                folder_header = nested_item.find('div', class_='d2l-textblock')
-                folder_name = folder_header.get_text(strip=True) if folder_header else None
+                folder_headers = _xpath(_TEXTBLOCK_XPATH)(nested_item)
+                folder_name = _get_text(folder_headers[0]) if folder_headers else None
                 if not folder_name or 'module:' in folder_name.lower():
                     continue
                 
-                folder_id_match = re.search(r'D2L_LE_Content_TreeBrowser_D2L\.LE\.Content\.ContentObject\.ModuleCO-(\d+)', nested_item['id'])
+                folder_id_match = _MODULE_ID_RE.search(nested_item.get('id'))
                 folder_id = folder_id_match.group(1) if folder_id_match else None
                 if not folder_id:
                     continue
                 
-                # Make request to navigate to this submodule
-                try:
-                    modified_url = content_url.rstrip('Home') + 'ModuleDetailsPartial'
-                    params = {
-                        'mId': folder_id,
-                        'writeHistoryEntry': '0',
-                        '_d2l_prc$headingLevel': '2',
-                        '_d2l_prc$scope': '',
-                        '_d2l_prc$hasActiveForm': 'false',
-                        'isXhr': 'true',
-                    }
-                    
-                    response = self.session.get(modified_url, params=params)
-                    
-                    # Parse the response to get submodule contents
-                    response = self.session.get(content_url)
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Extract materials from this submodule
-                    subfolder_materials = self._extract_materials_from_page(soup)
-                    
-                    # Create the subfolder entry
-                    subfolder = {
-                        'name': folder_name,
-                        'materials': subfolder_materials
-                    }
-                    
-                    # Add to parent module's subfolders
-                    if parent_name in modules:
-                        modules[parent_name]['subfolders'].append(subfolder)
-                    else:
-                        # If parent doesn't exist yet, create it
-                        modules[parent_name] = {
-                            'name': parent_name,
-                            'materials': [],
-                            'subfolders': [subfolder]
-                        }
-                        
-                except Exception as e:
-                    console.print(f"[yellow]Warning: Could not fetch contents for subfolder '{folder_name}': {e}[/yellow]")
+                subfolder_jobs.append((folder_id, folder_name, parent_name))
+            
+            # Fetch all subfolders concurrently, then merge the results in page order
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+            
+            results = [None] * len(subfolder_jobs)
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                futures = {
+                    executor.submit(self._fetch_subfolder, content_url, folder_id, folder_name, parent_name): idx
+                    for idx, (folder_id, folder_name, parent_name) in enumerate(subfolder_jobs)
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+            
+            for (_, folder_name, _), result in zip(subfolder_jobs, results):
+                if result is None:
+                    if failed_subfolders is not None:
+                        failed_subfolders.append(folder_name)
                     continue
+                
+                parent_name, subfolder = result
+                
+                # Add to parent module's subfolders
+                if parent_name in modules:
+                    modules[parent_name]['subfolders'].append(subfolder)
+                else:
+                    # If parent doesn't exist yet, create it
+                    modules[parent_name] = {
+                        'name': parent_name,
+                        'materials': [],
+                        'subfolders': [subfolder]
+                    }
             
             # Convert dict to list and format for output
             modules_list = []
@@ -565,20 +799,51 @@ class UforaCourses:
     def download_file(self, course_id, file_id, dest_path):
         """Download a file to the specified path"""
         url = f"{BASE_URL}/d2l/le/content/{course_id}/topics/files/download/{file_id}/DirectFileTopicDownload"
+        import uuid
+        
+        part_path = None
         
         try:
-            response = self.session.get(url, stream=True)
+            # Fail fast on connecting, but give slow transfers of large files time
+            response = self.session.get(url, stream=True, timeout=(5, 60))
             response.raise_for_status()
             
-            with open(dest_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Write to a temporary file of our own first so an interrupted download never
+            # leaves a partial file behind that looks complete
+            part_path = dest_path.with_name(f".{dest_path.name}.{uuid.uuid4().hex[:8]}.part")
+            
+            # Let urllib3 undo any gzip/deflate encoding while copying in 1 MiB blocks
+            response.raw.decode_content = True
+            with open(part_path, 'xb', buffering=1024 * 1024) as f:
+                shutil.copyfileobj(response.raw, f, length=1024 * 1024)
+            os.replace(part_path, dest_path)
             
             return True
         except Exception as e:
             console.print(f"[red]Error downloading file: {e}[/red]")
+            if part_path is not None:
+                try:
+                    part_path.unlink()
+                except OSError:
+                    pass
             return False
 
+    def download_files(self, jobs, max_workers=8, progress_task=None, progress_obj=None):
+        """
+        Download several files concurrently over the pooled session.
+        Takes a list of (course_id, file_id, dest_path) jobs and yields (job, success)
+        tuples as the downloads finish.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.download_file, *job): job for job in jobs}
+
+            for future in as_completed(futures):
+                if progress_obj and progress_task is not None:
+                    progress_obj.advance(progress_task)
+                yield futures[future], future.result()
+
 # The course content page state needs to be set to have the Table of Contents
 # as the active selected module, since we otherwise can't access the overview of all modules and submodules
 def set_table_of_contents_state(session, content_url):
@@ -625,6 +890,81 @@ def save_config(config):
         json.dump(config, f, indent=2)
 
 
+def load_courses_cache():
+    """Load the cached course list, or None if there is no cache or it is older than the TTL"""
+    try:
+        if time.time() - COURSES_CACHE_FILE.stat().st_mtime > COURSES_CACHE_TTL:
+            return None
+        with open(COURSES_CACHE_FILE, 'r') as f:
+            return json.load(f)['courses']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_courses_cache(course_list):
+    """Save the course list fetched from the API"""
+    with open(COURSES_CACHE_FILE, 'w') as f:
+        json.dump({'fetched_at': time.time(), 'courses': course_list}, f)
+
+
+def _content_cache_path(content_url):
+    """Cache file holding the scraped modules of a course content page"""
+    import hashlib
+    
+    return CONTENT_CACHE_DIR / f"{hashlib.sha1(content_url.encode('utf-8')).hexdigest()}.json"
+
+
+def load_content_cache(content_url):
+    """Load the cached modules of a course, or None if there is no cache or it is older than the TTL"""
+    cache_file = _content_cache_path(content_url)
+    try:
+        if time.time() - cache_file.stat().st_mtime > CONTENT_CACHE_TTL:
+            return None
+        with open(cache_file, 'r') as f:
+            return json.load(f)['modules']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_content_cache(content_url, modules):
+    """Save the modules scraped from a course content page"""
+    CONTENT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(_content_cache_path(content_url), 'w') as f:
+        json.dump({'fetched_at': time.time(), 'url': content_url, 'modules': modules}, f)
+
+
+def clear_caches():
+    """Remove the cached course list and course contents"""
+    shutil.rmtree(CONTENT_CACHE_DIR, ignore_errors=True)
+    try:
+        COURSES_CACHE_FILE.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def get_course_modules(session, ufora, content_url, use_cache=True):
+    """
+    Get the modules of a course, from the content cache when it is fresh.
+    Only authenticates when the content has to be fetched.
+    Returns None if authentication failed or the Table of Contents state could not be set.
+    """
+    modules = load_content_cache(content_url) if use_cache else None
+
+    if modules is None:
+        if not session.ensure_authenticated():
+            return None
+        if not set_table_of_contents_state(session, content_url):
+            return None
+        
+        failed_subfolders = []
+        modules = ufora.get_course_content(content_url, failed_subfolders)
+        # Don't let a transient error hide a subfolder until the cache expires
+        if modules and not failed_subfolders:
+            save_content_cache(content_url, modules)
+
+    return modules
+
+
 @click.group()
 def cli():
     """Ufora CLI - Download your UGent course material from the command line"""
@@ -639,13 +979,23 @@ def login():
 
 
 @cli.command()
-def courses():
+@click.option('--no-cache', is_flag=True, help='Fetch the course list from Ufora instead of using the cached one')
+def courses(no_cache):
     """List all your courses that started this year"""
-    session = UforaSession()
-    session.ensure_authenticated()
+    from datetime import datetime
+    from rich.table import Table
     
-    ufora = UforaCourses(session)
-    course_list = ufora.get_courses()
+    course_list = None if no_cache else load_courses_cache()
+    
+    if course_list is None:
+        session = UforaSession()
+        session.ensure_authenticated()
+        
+        ufora = UforaCourses(session)
+        course_list = ufora.get_courses()
+        
+        if course_list:
+            save_courses_cache(course_list)
     
     if not course_list:
         console.print("[yellow]No courses found. You may need to adjust the scraping selectors.[/yellow]")
@@ -691,8 +1041,11 @@ def courses():
 
 @cli.command()
 @click.argument('course_id', type=int)
-def materials(course_id):
+@click.option('--no-cache', is_flag=True, help='Fetch the course content from Ufora instead of using the cached one')
+def materials(course_id, no_cache):
     """List materials for a specific course (by ID from 'courses' command), including subfolders (in one table)"""
+    from rich.table import Table
+    
     config = load_config()
     courses = config.get('courses', [])
     
@@ -703,15 +1056,12 @@ def materials(course_id):
     course = courses[course_id - 1]
     
     session = UforaSession()
-    session.ensure_authenticated()
-    
     ufora = UforaCourses(session)
     url = course['content_url']
 
-    if not set_table_of_contents_state(session, url):
-        return []
-
-    modules = ufora.get_course_content(url)
+    modules = get_course_modules(session, ufora, url, use_cache=not no_cache)
+    if modules is None:
+        return
     
     if not modules:
         console.print("[yellow]No materials found or unable to parse content.[/yellow]")
@@ -749,42 +1099,104 @@ def materials(course_id):
     console.print()
 
 
-def download_materials(ufora, course_id, materials, base_dir, progress_task=None, progress_obj=None):
-    """Helper function to download materials to a directory"""
-    downloaded = 0
-    failed = 0
-        
+def _unique_path(path, taken):
+    """Pick a destination no other job of this run writes to, numbering duplicates like 'Slides (2)'"""
+    candidate = path
+    n = 2
+    while candidate in taken:
+        candidate = path.with_name(f"{path.stem} ({n}){path.suffix}")
+        n += 1
+    taken.add(candidate)
+    return candidate
+
+
+def _file_names(folder_materials):
+    """
+    Map the id of every downloadable material in a folder to its file name.
+    Duplicate titles are numbered in listing order, so a material gets the same name
+    whether it is downloaded on its own or with the rest of its folder.
+    """
+    taken = set()
+    return {
+        item['id']: _unique_path(Path(_sanitize(item['title'])), taken).name
+        for item in _downloadable(folder_materials)
+    }
+
+
+def _download_jobs(course_id, materials, base_dir, progress_task=None, progress_obj=None, force=False,
+                   folder_materials=None, taken=None):
+    """
+    Turn materials into (course_id, file_id, dest_path) download jobs.
+    File names are numbered against folder_materials, the full listing of the folder the
+    materials come from (defaults to materials itself).
+    The taken set keeps concurrent jobs of one run from sharing a destination;
+    pass the same set when building jobs for one run in several calls.
+    Files that already exist and are not empty are skipped unless force is set.
+    """
+    jobs = []
+    names = _file_names(materials if folder_materials is None else folder_materials)
+    if taken is None:
+        taken = set()
+    
     for item in materials:
-        filename = item['title']
-        # Sanitize filename
-        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-        dest_path = base_dir / filename
+        dest_path = _unique_path(base_dir / names[item['id']], taken)
         
-        # Don't try to download undownloadable content
-        if item['type'] in ['Assignment', 'Discussion Topic']:
-            if progress_obj and progress_task is not None:
-                progress_obj.advance(progress_task)
-            continue
+        if not force:
+            try:
+                if dest_path.stat().st_size > 0:
+                    console.print(f" [dim]↷ Skipping {dest_path.name}, already downloaded[/dim]")
+                    if progress_obj and progress_task is not None:
+                        progress_obj.advance(progress_task)
+                    continue
+            except FileNotFoundError:
+                pass
         
-        if ufora.download_file(course_id, item['id'], dest_path):
+        jobs.append((course_id, item['id'], dest_path))
+    
+    return jobs
+
+
+def run_downloads(ufora, jobs, progress_task=None, progress_obj=None, threads=DEFAULT_DOWNLOAD_THREADS):
+    """Run download jobs several files at a time and report the result of each one"""
+    downloaded = 0
+    failed = 0
+    
+    for (_, _, dest_path), success in ufora.download_files(jobs, threads, progress_task, progress_obj):
+        if success:
             console.print(f" [green]✓ Saved to {dest_path}[/green]")
             downloaded += 1
         else:
-            console.print(f" [red]✗ Failed to download {filename}[/red]")
+            console.print(f" [red]✗ Failed to download {dest_path.name}[/red]")
             failed += 1
-        
-        if progress_obj and progress_task is not None:
-            progress_obj.advance(progress_task)
     
     return downloaded, failed
 
 
+def download_materials(ufora, course_id, materials, base_dir, progress_task=None, progress_obj=None, threads=DEFAULT_DOWNLOAD_THREADS, force=False,
+                       folder_materials=None):
+    """Helper function to download materials to a directory, several files at a time.
+
+    Expects materials already filtered with _downloadable(). Pass the full listing of their
+    folder as folder_materials when downloading only some of its files.
+    """
+    jobs = _download_jobs(course_id, materials, base_dir, progress_task, progress_obj, force, folder_materials)
+    return run_downloads(ufora, jobs, progress_task, progress_obj, threads)
+
+
 @cli.command()
 @click.argument('course_id', type=int)
 @click.option('--dir', '-d', default=None, help='Target directory (relative or absolute path)')
 @click.option('--base', '-b', is_flag=True, help='Download to configured base directory')
-def download(course_id, dir, base):
+@click.option('--threads', '-t', type=click.IntRange(1, HTTP_POOL_SIZE), default=DEFAULT_DOWNLOAD_THREADS, show_default=True,
+              help='Number of files to download at the same time')
+@click.option('--force', '-f', is_flag=True, help='Download files again even if they already exist')
+@click.option('--no-cache', is_flag=True, help='Fetch the course content from Ufora instead of using the cached one')
+def download(course_id, dir, base, threads, force, no_cache):
     """Download course materials"""
+    from rich.progress import Progress
+    from rich.prompt import Prompt
+    from rich.table import Table
+    
     config = load_config()
     courses = config.get('courses', [])
     
@@ -809,15 +1221,15 @@ def download(course_id, dir, base):
     target_dir.mkdir(parents=True, exist_ok=True)
     
     session = UforaSession()
-    session.ensure_authenticated()
+    if not session.ensure_authenticated():
+        return
     
     ufora = UforaCourses(session)
     url = course['content_url']
 
-    if not set_table_of_contents_state(session, url):
-        return []
-
-    materials = ufora.get_course_content(url)
+    materials = get_course_modules(session, ufora, url, use_cache=not no_cache)
+    if materials is None:
+        return
     
     if not materials:
         console.print("[yellow]No materials found[/yellow]")
@@ -853,12 +1265,14 @@ def download(course_id, dir, base):
     table.add_column("File Name")
     table.add_column("Type", style="cyan")
     
-    for idx, material in enumerate(selected_module['materials'], start=1):
-        table.add_row(str(idx), material['title'], material['type'])
-
-    if 'subfolders' in selected_module and selected_module['subfolders']:
-        for idx, folder in enumerate(selected_module['subfolders'], start=1):
-            table.add_row(str(len(selected_module['materials']) + idx), f"{folder['name']}", 'Folder')
+    num_materials = len(selected_module['materials'])
+    rows = [(str(idx), material['title'], material['type'])
+            for idx, material in enumerate(selected_module['materials'], start=1)]
+    rows.extend((str(num_materials + idx), folder['name'], 'Folder')
+                for idx, folder in enumerate(selected_module.get('subfolders', []), start=1))
+
+    for row in rows:
+        table.add_row(*row)
     
     console.print()
     console.print(table)
@@ -875,37 +1289,38 @@ def download(course_id, dir, base):
             console.print()
 
             # Calculate total items to download (including subfolder contents)
-            total_items = len(selected_module['materials'])
-            for subfolder in selected_module.get('subfolders', []):
-                total_items += len(subfolder['materials'])
+            subfolders = selected_module.get('subfolders', [])
+            module_files = _downloadable(selected_module['materials'])
+            subfolder_files = [_downloadable(subfolder['materials']) for subfolder in subfolders]
+            total_items = len(module_files) + sum(len(files) for files in subfolder_files)
+            
+            # Create each subfolder directory that will receive files exactly once
+            subfolder_dirs = [target_dir / _sanitize(subfolder['name']) for subfolder in subfolders]
+            dirs_needed = {folder for folder, files in zip(subfolder_dirs, subfolder_files) if files}
+            for folder in dirs_needed:
+                folder.mkdir(parents=True, exist_ok=True)
             
             with Progress() as progress:
                 task = progress.add_task("[cyan]Downloading...", total=total_items)
                 console.print()
 
-                # Download files in the main module
-                if selected_module['materials']:
-                    download_materials(ufora, course['id'], selected_module['materials'], target_dir, task, progress)
+                # Queue the files of the main module and all subfolders, then download
+                # them in one pool so small folders don't leave worker threads idle
+                taken = set()
+                jobs = _download_jobs(course['id'], module_files, target_dir, task, progress, force, taken=taken)
+                for subfolder, subfolder_dir, files in zip(subfolders, subfolder_dirs, subfolder_files):
+                    if not files:
+                        console.print(f"[yellow]No downloadable content in subfolder {subfolder['name']}[/yellow]")
+                        continue
+                    jobs.extend(_download_jobs(course['id'], files, subfolder_dir, task, progress, force, taken=taken))
                 
-                # Download files in subfolders
-                for subfolder in selected_module.get('subfolders', []):
-                    # Create subfolder directory
-                    folder_name = re.sub(r'[<>:"/\\|?*]', '_', subfolder['name'])
-                    subfolder_dir = target_dir / folder_name
-                    subfolder_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    console.print(f"[cyan]Downloading subfolder: {subfolder['name']}[/cyan]")
-                    if all(material['type'] in ['Assignment', 'Discussion Topic'] for material in subfolder['materials']):
-                        console.print('[yellow]No downloadable content in this folder[/yellow]')
-                    if subfolder['materials']:
-                        download_materials(ufora, course['id'], subfolder['materials'], subfolder_dir, task, progress)
+                run_downloads(ufora, jobs, task, progress, threads)
             
             console.print(f"[green]✓ Download complete![/green]\n")
             break
         
         try:
             choice_idx = int(file_choice)
-            num_materials = len(selected_module['materials'])
             num_subfolders = len(selected_module.get('subfolders', []))
             total_items = num_materials + num_subfolders
             
@@ -917,11 +1332,17 @@ def download(course_id, dir, base):
                 console.print()
 
                 # User selected a file
-                to_download = [selected_module['materials'][choice_idx - 1]]
+                selected_file = selected_module['materials'][choice_idx - 1]
+                to_download = _downloadable([selected_file])
+                
+                if not to_download:
+                    console.print(f"[yellow]{selected_file['type']} items can't be downloaded[/yellow]\n")
+                    break
                 
                 with Progress() as progress:
                     task = progress.add_task("[cyan]Downloading...", total=len(to_download))
-                    download_materials(ufora, course['id'], to_download, target_dir, task, progress)
+                    download_materials(ufora, course['id'], to_download, target_dir, task, progress, threads, force,
+                                       selected_module['materials'])
                 
                 console.print(f"[green]✓ Download complete![/green]\n")
                 break
@@ -936,8 +1357,10 @@ def download(course_id, dir, base):
                 subfolder_table.add_column("File Name")
                 subfolder_table.add_column("Type", style="cyan")
                 
-                for idx, material in enumerate(selected_subfolder['materials'], start=1):
-                    subfolder_table.add_row(str(idx), material['title'], material['type'])
+                rows = [(str(idx), material['title'], material['type'])
+                        for idx, material in enumerate(selected_subfolder['materials'], start=1)]
+                for row in rows:
+                    subfolder_table.add_row(*row)
                 
                 console.print()
                 console.print(subfolder_table)
@@ -951,34 +1374,37 @@ def download(course_id, dir, base):
                     )
                     
                     if subfolder_choice.lower() == "all":
-                        to_download = selected_subfolder['materials']
+                        to_download = _downloadable(selected_subfolder['materials'])
                     else:
                         try:
                             subfolder_file_idx = int(subfolder_choice)
                             if subfolder_file_idx < 1 or subfolder_file_idx > len(selected_subfolder['materials']):
                                 raise ValueError(f"Invalid ID. Please enter a number between 1 and {len(selected_subfolder['materials'])}.")
                             
-                            to_download = [selected_subfolder['materials'][subfolder_file_idx - 1]]
+                            to_download = _downloadable([selected_subfolder['materials'][subfolder_file_idx - 1]])
                         except ValueError as e:
                             console.print(f"[red]{e}[/red]")
                             continue
                     
-                    # Create subfolder directory
-                    folder_name = re.sub(r'[<>:"/\\|?*]', '_', selected_subfolder['name'])
+                    console.print()
+
+                    if not to_download:
+                        console.print('[yellow]No downloadable content in this folder[/yellow]\n')
+                        break
+
+                    # Create subfolder directory, only once there is something to put in it
+                    folder_name = _sanitize(selected_subfolder['name'])
                     # Add files under folder name if we are downloading to set base directory
                     if base:
                         subfolder_dir = target_dir / folder_name
                     else:
                         subfolder_dir = target_dir
                     subfolder_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    console.print()
 
                     with Progress() as progress:
                         task = progress.add_task("[cyan]Downloading...", total=len(to_download))
-                        if all(material['type'] in ['Assignment', 'Discussion Topic'] for material in to_download):
-                            console.print('\nNo downloadable content in this folder')
-                        download_materials(ufora, course['id'], to_download, subfolder_dir, task, progress)
+                        download_materials(ufora, course['id'], to_download, subfolder_dir, task, progress, threads, force,
+                                           selected_subfolder['materials'])
 
                     console.print(f"[green]✓ Download complete![/green]\n")
                     break
@@ -988,6 +1414,19 @@ def download(course_id, dir, base):
         except ValueError as e:
             console.print(f"[red]{e}[/red]")
 
+@cli.group()
+def cache():
+    """Manage the locally cached course data"""
+    pass
+
+
+@cache.command('clear')
+def cache_clear():
+    """Remove the cached course list and course contents"""
+    clear_caches()
+    console.print("[green]✓ Cache cleared[/green]")
+
+
 @cli.command()
 @click.argument('file_path', type=click.Path(exists=True))
 def importtimetable(file_path):
@@ -1017,13 +1456,52 @@ def importtimetable(file_path):
         import traceback
         traceback.print_exc()
 
+def _date_display(date_str):
+    """Format a DD-MM-YYYY timetable date as e.g. 'Mon 20/10'"""
+    from datetime import date
+    
+    # The parts are already zero-padded, so only the weekday needs a date object
+    day, month, year = date_str.split('-')
+    return f"{date(int(year), int(month), int(day)):%a} {day}/{month}"
+
+
+def _course_row(course, compact):
+    """Table cells for one course in the timetable"""
+    row = [course['time_slot'], course['course_name'], course['course_type'], course['location']]
+    if not compact:
+        row.append(", ".join(course['professors']) or "—")
+    return row
+
+
+def _build_schedule_table(rows, compact, with_date=False):
+    """Build the timetable table, with a leading date column for the week view"""
+    from rich.table import Table
+    
+    table = Table(show_header=True, header_style="bold magenta")
+    if with_date:
+        table.add_column("Date", style="bold yellow", width=15)
+    table.add_column("Time", style="cyan", width=20)
+    table.add_column("Course", style="green", width=30)
+    table.add_column("Type", style="yellow", width=15)
+    table.add_column("Location", style="blue", width=30)
+    if not compact:
+        table.add_column("Professor(s)", style="magenta", width=25)
+    
+    for row in rows:
+        table.add_row(*row)
+    
+    return table
+
+
 @cli.command()
 @click.option('--week', '-w', is_flag=True, help='Show entire week instead of just today')
 @click.option('--compact', '-c', is_flag=True, help='Hide professors column for compact view')
 def timetable(week, compact):
     """Display your timetable for today (or the entire week with --week)"""
+    from datetime import datetime
+    
     try:
-        from .timeedit_parser import load_timetable_json
+        from .timeedit_parser import load_timetable_json, index_timetable_by_date, index_timetable_by_week
         
         json_path = CONFIG_DIR / "timetable.json"
         
@@ -1035,16 +1513,13 @@ def timetable(week, compact):
         
         # Load timetable
         timetable_data = load_timetable_json(str(json_path))
+        by_date = index_timetable_by_date(timetable_data)
         
         # Get today's date in DD-MM-YYYY format
         today = datetime.now().strftime("%d-%m-%Y")
         
-        # Find today to determine week number
-        current_week_num = None
-        for (date_str, week_num), courses in timetable_data.items():
-            if date_str == today:
-                current_week_num = week_num
-                break
+        # Look up today to determine week number
+        current_week_num, today_courses = by_date.get(today, (None, None))
         
         if current_week_num is None:
             console.print(f"[yellow]No courses scheduled for today ({today})[/yellow]")
@@ -1052,10 +1527,7 @@ def timetable(week, compact):
         
         if week:
             # Show entire week
-            week_days = sorted([
-                (date_str, courses) for (date_str, w), courses in timetable_data.items()
-                if w == current_week_num
-            ])
+            week_days = index_timetable_by_week(timetable_data).get(current_week_num, [])
             
             if not week_days:
                 console.print(f"[yellow]No courses scheduled for week {current_week_num}[/yellow]")
@@ -1063,86 +1535,36 @@ def timetable(week, compact):
             
             console.print(f"\n[bold cyan]Your Schedule for Week {current_week_num}[/bold cyan]\n")
             
-            table = Table(show_header=True, header_style="bold magenta")
-            table.add_column("Date", style="bold yellow", width=15)
-            table.add_column("Time", style="cyan", width=20)
-            table.add_column("Course", style="green", width=30)
-            table.add_column("Type", style="yellow", width=15)
-            table.add_column("Location", style="blue", width=30)
-            if not compact:
-                table.add_column("Professor(s)", style="magenta", width=25)
-
+            rows = []
             for date_str, courses in week_days:
-                date_obj = datetime.strptime(date_str, "%d-%m-%Y")
-                day_name = date_obj.strftime("%a")
-                formatted_date = date_obj.strftime("%d/%m")
-                date_display = f"{day_name} {formatted_date}"
+                date_display = _date_display(date_str)
 
                 if not courses:
                     row = [date_display, "—", "No courses", "—", "—"]
                     if not compact:
                         row.append("—")
-                    table.add_row(*row)
+                    rows.append(row)
                     continue
 
-                for i, course in enumerate(courses):
-                    professors = ", ".join(course['professors']) if course['professors'] else "—"
-                    # Only show the date for the first course of the day
-                    row = [
-                        date_display if i == 0 else "",
-                        course['time_slot'],
-                        course['course_name'],
-                        course['course_type'],
-                        course['location']
-                    ]
-                    if not compact:
-                        row.append(professors)
-                    table.add_row(*row)
+                # Only show the date for the first course of the day
+                rows.extend([date_display if i == 0 else ""] + _course_row(course, compact)
+                            for i, course in enumerate(courses))
 
-            console.print(table)
+            console.print(_build_schedule_table(rows, compact, with_date=True))
             console.print()
         
         else:
             # Show only today
-            today_courses = None
-            for (date_str, week_num), courses in timetable_data.items():
-                if date_str == today:
-                    today_courses = courses
-                    break
-            
             if not today_courses:
                 console.print(f"[yellow]No courses scheduled for today ({today})[/yellow]")
                 return
             
-            # Format today's date
-            date_obj = datetime.strptime(today, "%d-%m-%Y")
-            day_name = date_obj.strftime("%a")
-            formatted_date = date_obj.strftime("%d/%m")
-            date_display = f"{day_name} {formatted_date}"
+            date_display = _date_display(today)
             
             console.print(f"\n[bold cyan]Your Schedule for Today (W{current_week_num}) - {date_display}[/bold cyan]\n")
             
-            table = Table(show_header=True, header_style="bold magenta")
-            table.add_column("Time", style="cyan", width=20)
-            table.add_column("Course", style="green", width=30)
-            table.add_column("Type", style="yellow", width=15)
-            table.add_column("Location", style="blue", width=30)
-            if not compact:
-                table.add_column("Professor(s)", style="magenta", width=25)
-            
-            for course in today_courses:
-                professors = ", ".join(course['professors']) if course['professors'] else "—"
-                row = [
-                    course['time_slot'],
-                    course['course_name'],
-                    course['course_type'],
-                    course['location']
-                ]
-                if not compact:
-                    row.append(professors)
-                table.add_row(*row)
-            
-            console.print(table)
+            rows = [_course_row(course, compact) for course in today_courses]
+            console.print(_build_schedule_table(rows, compact))
             console.print()
         
     except ImportError:
@@ -1,6 +1,34 @@
+import os
 import re
+from pathlib import Path
 from typing import Dict, Tuple, List
 
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:  # fall back to the stdlib if orjson is unavailable
+    import json
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+    _loads = json.loads
+
+# Matches either a date header like "Ma W 43 20-10-2025" (groups 1-3) or a course line
+# like "HH:MM - HH:MM , CourseCode. CourseName, CourseType, Location, Professors" (groups 4-5).
+# [^\S\n] is whitespace other than a newline, so matches never run across lines.
+_LINE_RE = re.compile(
+    r'^[^\S\n]*(?:'
+    r'([A-Z][a-z])[^\S\n]+W[^\S\n]+(\d+)[^\S\n]+(\d{2}-\d{2}-\d{4}).*'
+    r'|(\d{2}:\d{2}[^\S\n]*-[^\S\n]*\d{2}:\d{2})[^\S\n]*,[^\S\n]*(.*?)[^\S\n]*'
+    r')$',
+    re.MULTILINE
+)
+
 def parse_timeedit_file(file_path: str) -> Dict[Tuple[str, int], List[Dict]]:
     """
     Parse a TimeEdit timetable file and return structured course data.
@@ -9,46 +37,32 @@ def parse_timeedit_file(file_path: str) -> Dict[Tuple[str, int], List[Dict]]:
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # Split by date headers like "Ma W 43 20-10-2025"
-    date_pattern = r'([A-Z][a-z])\s+W\s+(\d+)\s+(\d{2}-\d{2}-\d{4})'
-    
     timetable = {}
     current_week = None
     current_date_str = None
     current_day_courses = []
     
-    for line in content.split('\n'):
-        line = line.strip()
-        
-        if not line:
-            continue
+    # A single pass over the text; lines that are neither a date header nor a course are skipped
+    for match in _LINE_RE.finditer(content):
+        day_abbr, week_num, date_str, time_slot, rest_of_line = match.groups()
         
         # Check if this is a date header
-        date_match = re.match(date_pattern, line)
-        if date_match:
+        if date_str:
             # Save previous day's courses if any
             if current_date_str and current_week is not None and current_day_courses:
                 key = (current_date_str, current_week)
                 timetable[key] = current_day_courses
             
             # Start new day
-            day_abbr, week_num, date_str = date_match.groups()
             current_week = int(week_num)
             current_date_str = date_str
             current_day_courses = []
             continue
         
-        # Check if this is a course line
-        # Pattern: HH:MM - HH:MM , CourseCode. CourseName, CourseType, Location, Professors
-        course_pattern = r'^(\d{2}:\d{2}\s*-\s*\d{2}:\d{2})\s*,\s*(.*)$'
-        course_match = re.match(course_pattern, line)
-        
-        if course_match and current_date_str and current_week is not None:
-            time_slot = course_match.group(1)
-            rest_of_line = course_match.group(2)
-            
-            # Parse the course details
-            parts = [p.strip() for p in rest_of_line.split(',')]
+        # Otherwise this is a course line
+        if current_date_str and current_week is not None:
+            # Parse the course details; everything after the third comma is professors
+            parts = rest_of_line.split(',', 3)
             
             course_code = ""
             course_name = ""
@@ -56,13 +70,11 @@ def parse_timeedit_file(file_path: str) -> Dict[Tuple[str, int], List[Dict]]:
             location = ""
             professors = []
             
-            if parts:
-                # First part contains code and name separated by a period
-                first_part = parts[0]
-                code_name_split = first_part.split('.', 1)
-                if len(code_name_split) == 2:
-                    course_code = code_name_split[0].strip()
-                    course_name = code_name_split[1].strip()
+            # First part contains code and name separated by a period
+            code_name_split = parts[0].split('.', 1)
+            if len(code_name_split) == 2:
+                course_code = code_name_split[0].strip()
+                course_name = code_name_split[1].strip()
             
             if len(parts) > 1:
                 course_type = parts[1].strip()
@@ -72,9 +84,9 @@ def parse_timeedit_file(file_path: str) -> Dict[Tuple[str, int], List[Dict]]:
             
             # Collect remaining parts as professors
             if len(parts) > 3:
-                for prof_part in parts[3:]:
+                for prof_part in parts[3].split(','):
                     prof_part = prof_part.strip()
-                    if prof_part and prof_part.lower() not in ['', 'none']:
+                    if prof_part and prof_part.lower() != 'none':
                         professors.append(prof_part)
             
             course = {
@@ -98,21 +110,18 @@ def parse_timeedit_file(file_path: str) -> Dict[Tuple[str, int], List[Dict]]:
 
 def save_timetable_json(timetable: Dict, output_path: str):
     """Save timetable to JSON file for persistence."""
-    import json
-    
     # Convert tuple keys to strings for JSON serialization
     json_data = {f"{date}|W{week}": courses for (date, week), courses in timetable.items()}
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(json_data, f, indent=2, ensure_ascii=False)
+    # Write next to the target and swap it in, so an interrupted import keeps the old timetable
+    tmp_path = Path(output_path).with_suffix('.tmp')
+    tmp_path.write_bytes(_dumps(json_data))
+    os.replace(tmp_path, output_path)
 
 
 def load_timetable_json(json_path: str) -> Dict[Tuple[str, int], List[Dict]]:
     """Load timetable from JSON file."""
-    import json
-    
-    with open(json_path, 'r', encoding='utf-8') as f:
-        json_data = json.load(f)
+    json_data = _loads(Path(json_path).read_bytes())
     
     # Convert back to tuple keys
     timetable = {}
@@ -124,6 +133,24 @@ def load_timetable_json(json_path: str) -> Dict[Tuple[str, int], List[Dict]]:
     return timetable
 
 
+def index_timetable_by_date(timetable: Dict[Tuple[str, int], List[Dict]]) -> Dict[str, Tuple[int, List[Dict]]]:
+    """Index the timetable by date, mapping each date to its (week number, courses)."""
+    return {date_str: (week_num, courses) for (date_str, week_num), courses in timetable.items()}
+
+
+def index_timetable_by_week(timetable: Dict[Tuple[str, int], List[Dict]]) -> Dict[int, List[Tuple[str, List[Dict]]]]:
+    """Index the timetable by week number, mapping each week to its (date, courses) pairs sorted by date."""
+    by_week = {}
+    for (date_str, week_num), courses in timetable.items():
+        by_week.setdefault(week_num, []).append((date_str, courses))
+    
+    # Dates are DD-MM-YYYY, so compare them as (year, month, day)
+    for days in by_week.values():
+        days.sort(key=lambda day: day[0].split('-')[::-1])
+    
+    return by_week
+
+
 def display_timetable(timetable: Dict[Tuple[str, int], List[Dict]]):
     """Pretty print the timetable."""
     for (date_str, week), courses in sorted(timetable.items()):